@@ -1,7 +1,6 @@
 import os
 import time
 import asyncio
-import json
 import sys
 import threading
 import http.server
@@ -13,8 +12,14 @@ from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # Basic runtime settings
 CONSOLE_OUTPUT = True
 logger = logging.getLogger("ensemble_reasoning.models")
@@ -88,7 +93,7 @@ def load_config(config_path: Path | None = None) -> ServerConfig:
 
     if path.exists():
         try:
-            data = yaml.safe_load(path.read_text()) or {}
+            data = yaml.load(path.read_text(), Loader=_Loader) or {}
             for key, value in data.items():
                 if hasattr(cfg, key):
                     setattr(cfg, key, value)
@@ -358,8 +363,8 @@ def _metrics_exporter_worker():
             
             # Atomic write: write to temp file then rename
             temp_path = export_path.with_suffix(export_path.suffix + ".tmp")
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2)
+            with open(temp_path, "wb") as f:
+                f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             temp_path.replace(export_path)
             
             logger.debug(f"Exported metrics to {export_path}")
@@ -518,8 +523,8 @@ def log_session_event(session: EnsembleSession, event_type: str, details: dict |
         if details:
             payload["details"] = details
             
-        with path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload) + "\n")
+        with path.open("ab") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS))
     except Exception:
         logger.debug("session log failed", exc_info=True)
 
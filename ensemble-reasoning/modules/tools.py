@@ -1,10 +1,10 @@
-import json
 import logging
 import sys
 import time
 from collections import deque
 from uuid import uuid4
 
+import orjson
 from mcp.types import TextContent
 
 from . import models
@@ -20,7 +20,7 @@ logger = logging.getLogger("ensemble_reasoning.tools")
 
 
 def _ok(**payload) -> list[TextContent]:
-    return [TextContent(type="text", text=json.dumps({"status": "success", "result": payload}))]
+    return [TextContent(type="text", text=orjson.dumps({"status": "success", "result": payload}, option=orjson.OPT_NON_STR_KEYS).decode())]
 
 
 def _err(error: str, message: str | None = None, **payload) -> list[TextContent]:
@@ -29,7 +29,7 @@ def _err(error: str, message: str | None = None, **payload) -> list[TextContent]
         body["message"] = message
     if payload:
         body["details"] = payload
-    return [TextContent(type="text", text=json.dumps(body))]
+    return [TextContent(type="text", text=orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS).decode())]
 
 
 async def tool_start_collaborative(args: dict) -> list[TextContent]:
@@ -10,12 +10,16 @@ A collaborative thinking framework where multiple agent lenses work together:
 """
 
 import asyncio
-import json
 import logging
 import os
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import orjson
 
 # Add parent directory to path for shared utils
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -25,7 +29,7 @@ from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, Icon
 
-from utils import setup_logging
+from utils import icon_src, setup_logging
 
 # Import models and helpers from the `modules` package
 from modules.models import (
@@ -59,10 +63,10 @@ logger = logging.getLogger("ensemble_reasoning.server")
 # MCP Server Setup
 # ============================================================================
 
-# Create icon from SVG file using file:// URI
+# Create icon from SVG file, inlined as a data: URI (file:// if unreadable)
 _icon_path = Path(__file__).parent / "assets" / "icon.svg"
 _server_icon = Icon(
-    src=f"file://{_icon_path.resolve()}",
+    src=icon_src(_icon_path),
     mimeType="image/svg+xml",
 )
 
@@ -71,7 +75,8 @@ server = Server(
     icons=[_server_icon],
 )
 
-_AGENT_LENS_NAMES = list(AGENT_LENSES.keys())
+# JSON Schema "enum" must be an array; a tuple fails jsonschema validation of tool arguments
+_AGENT_LENS_NAMES = list(AGENT_LENSES)
 
 TOOL_HANDLERS = {
     "start_collaborative_reasoning": tool_start_collaborative,
@@ -86,139 +91,158 @@ TOOL_HANDLERS = {
 }
 
 
+# Static literals, so the models are built without re-running Pydantic validation
+TOOLS = (
+    Tool.model_construct(
+        name="start_collaborative_reasoning",
+        description="Start a collaborative reasoning session with multiple agent lenses working together.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "problem": {"type": "string", "description": "The problem to solve collaboratively"},
+                "agentLenses": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": _AGENT_LENS_NAMES},
+                    "description": "Which agent lenses to include (analytical, skeptical, creative, pragmatic, ethical)"
+                }
+            },
+            "required": ["problem", "agentLenses"]
+        }
+    ),
+    Tool.model_construct(
+        name="contribute_perspective",
+        description="Contribute a thought from a specific agent lens perspective.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sessionId": {"type": "string", "description": "The ensemble session ID"},
+                "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES},
+                "thought": {"type": "string", "description": "The insight or reasoning from this lens"},
+                "buildsOn": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "Thought IDs this builds upon (from other agents)"
+                },
+                "weight": {
+                    "type": "number",
+                    "minimum": 0,
+                    "maximum": 1,
+                    "description": "Confidence in this perspective (0-1)"
+                }
+            },
+            "required": ["sessionId", "agentLens", "thought"]
+        }
+    ),
+    Tool.model_construct(
+        name="endorse_or_challenge",
+        description="Have one agent lens endorse or challenge another's thought.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sessionId": {"type": "string"},
+                "thoughtId": {"type": "integer", "description": "The thought to react to"},
+                "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES},
+                "endorsementLevel": {
+                    "type": "number",
+                    "minimum": -1,
+                    "maximum": 1,
+                    "description": "Agreement level: -1 (disagree) to +1 (fully agree)"
+                },
+                "note": {"type": "string", "description": "Why this lens agrees or disagrees"}
+            },
+            "required": ["sessionId", "thoughtId", "agentLens", "endorsementLevel"]
+        }
+    ),
+    Tool.model_construct(
+        name="synthesize_convergence",
+        description="Analyze the ensemble to find consensus, tensions, and synthesis opportunities.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sessionId": {"type": "string"},
+                "threshold": {
+                    "type": "number",
+                    "minimum": 0,
+                    "maximum": 1,
+                    "description": "Consensus threshold (default 0.6)"
+                }
+            },
+            "required": ["sessionId"]
+        }
+    ),
+    Tool.model_construct(
+        name="propose_integration",
+        description="Propose a synthesis that integrates multiple perspectives.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sessionId": {"type": "string"},
+                "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES},
+                "integration": {"type": "string", "description": "The synthesis that reconciles different views"},
+                "reconciles": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "Thought IDs being integrated"
+                }
+            },
+            "required": ["sessionId", "agentLens", "integration", "reconciles"]
+        }
+    ),
+    Tool.model_construct(
+        name="get_convergence_map",
+        description="Get a visual overview of where agents agree, disagree, and opportunities for synthesis.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sessionId": {"type": "string"}
+            },
+            "required": ["sessionId"]
+        }
+    ),
+    Tool.model_construct(
+        name="get_active_session",
+        description="Get details of the current active ensemble session.",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    Tool.model_construct(
+        name="get_metrics",
+        description="Get per-agent rate limiter status (current op count in sliding window).",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool.model_construct(
+        name="reset_agent_rate",
+        description="Admin: reset/clear the rate window for a given agent lens.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES, "description": "The agent lens to reset"}
+            },
+            "required": ["agentLens"]
+        }
+    )
+)
+
+
 @server.list_tools()
-async def handle_list_tools() -> list[Tool]:
+async def handle_list_tools() -> tuple[Tool, ...]:
     """List all available tools"""
+    return TOOLS
+
+
+# Shared read-only stand-in for omitted arguments (handlers only read args)
+_EMPTY_ARGS: Mapping[str, Any] = MappingProxyType({})
+
+
+@lru_cache(maxsize=64)
+def _unknown_tool_response(name: str) -> list[TextContent]:
+    """Error response for an unknown tool name, built once per name (do not mutate)."""
     return [
-        Tool(
-            name="start_collaborative_reasoning",
-            description="Start a collaborative reasoning session with multiple agent lenses working together.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "problem": {"type": "string", "description": "The problem to solve collaboratively"},
-                    "agentLenses": {
-                        "type": "array",
-                        "items": {"type": "string", "enum": _AGENT_LENS_NAMES},
-                        "description": "Which agent lenses to include (analytical, skeptical, creative, pragmatic, ethical)"
-                    }
-                },
-                "required": ["problem", "agentLenses"]
-            }
-        ),
-        Tool(
-            name="contribute_perspective",
-            description="Contribute a thought from a specific agent lens perspective.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sessionId": {"type": "string", "description": "The ensemble session ID"},
-                    "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES},
-                    "thought": {"type": "string", "description": "The insight or reasoning from this lens"},
-                    "buildsOn": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Thought IDs this builds upon (from other agents)"
-                    },
-                    "weight": {
-                        "type": "number",
-                        "minimum": 0,
-                        "maximum": 1,
-                        "description": "Confidence in this perspective (0-1)"
-                    }
-                },
-                "required": ["sessionId", "agentLens", "thought"]
-            }
-        ),
-        Tool(
-            name="endorse_or_challenge",
-            description="Have one agent lens endorse or challenge another's thought.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sessionId": {"type": "string"},
-                    "thoughtId": {"type": "integer", "description": "The thought to react to"},
-                    "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES},
-                    "endorsementLevel": {
-                        "type": "number",
-                        "minimum": -1,
-                        "maximum": 1,
-                        "description": "Agreement level: -1 (disagree) to +1 (fully agree)"
-                    },
-                    "note": {"type": "string", "description": "Why this lens agrees or disagrees"}
-                },
-                "required": ["sessionId", "thoughtId", "agentLens", "endorsementLevel"]
-            }
-        ),
-        Tool(
-            name="synthesize_convergence",
-            description="Analyze the ensemble to find consensus, tensions, and synthesis opportunities.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sessionId": {"type": "string"},
-                    "threshold": {
-                        "type": "number",
-                        "minimum": 0,
-                        "maximum": 1,
-                        "description": "Consensus threshold (default 0.6)"
-                    }
-                },
-                "required": ["sessionId"]
-            }
-        ),
-        Tool(
-            name="propose_integration",
-            description="Propose a synthesis that integrates multiple perspectives.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sessionId": {"type": "string"},
-                    "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES},
-                    "integration": {"type": "string", "description": "The synthesis that reconciles different views"},
-                    "reconciles": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "Thought IDs being integrated"
-                    }
-                },
-                "required": ["sessionId", "agentLens", "integration", "reconciles"]
-            }
-        ),
-        Tool(
-            name="get_convergence_map",
-            description="Get a visual overview of where agents agree, disagree, and opportunities for synthesis.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sessionId": {"type": "string"}
-                },
-                "required": ["sessionId"]
-            }
-        ),
-        Tool(
-            name="get_active_session",
-            description="Get details of the current active ensemble session.",
-            inputSchema={"type": "object", "properties": {}}
-        ),
-        Tool(
-            name="get_metrics",
-            description="Get per-agent rate limiter status (current op count in sliding window).",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="reset_agent_rate",
-            description="Admin: reset/clear the rate window for a given agent lens.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "agentLens": {"type": "string", "enum": _AGENT_LENS_NAMES, "description": "The agent lens to reset"}
-                },
-                "required": ["agentLens"]
-            }
+        TextContent(
+            type="text",
+            text=orjson.dumps({"status": "error", "error": "unknown_tool", "details": {"tool": name}}).decode(),
         )
     ]
 
@@ -226,30 +250,38 @@ async def handle_list_tools() -> list[Tool]:
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
     try:
-        logger.debug("call_tool name=%s args=%s", name, arguments)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("call_tool name=%s args=%s", name, arguments)
         if handler := TOOL_HANDLERS.get(name):
-            return await handler(arguments or {})
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"status": "error", "error": "unknown_tool", "details": {"tool": name}}),
-            )
-        ]
+            return await handler(arguments if arguments is not None else _EMPTY_ARGS)
+        return _unknown_tool_response(name)
     except Exception as e:
         logger.exception("Tool error")
         return [
             TextContent(
                 type="text",
-                text=json.dumps({
+                text=orjson.dumps({
                     "status": "error",
                     "error": "internal_error",
                     "message": "Tool execution failed",
                     "details": {"tool": name, "reason": str(e)},
-                }),
+                }).decode(),
             )
         ]
 
 
+# Built once, after all handlers are registered (capabilities reflect them)
+_INIT_OPTS = InitializationOptions(
+    server_name="Ensemble Reasoning",
+    server_version="1.0.0",
+    capabilities=server.get_capabilities(
+        notification_options=NotificationOptions(),
+        experimental_capabilities={},
+    ),
+    icons=[_server_icon],
+)
+
+
 # ============================================================================
 # Main
 # ============================================================================
@@ -259,7 +291,7 @@ async def main():
     """Run the MCP server"""
     # Logging is disabled by default; enable via config.yaml (logging_enabled: true)
     if CONFIG.logging_enabled:
-        log_file = setup_logging("ensemble-reasoning")
+        log_file, _ = setup_logging("ensemble-reasoning")
         logger.debug("server starting log_file=%s", log_file)
     else:
         logging.disable(logging.CRITICAL)
@@ -273,15 +305,7 @@ async def main():
             await server.run(
                 read_stream,
                 write_stream,
-                InitializationOptions(
-                    server_name="Ensemble Reasoning",
-                    server_version="1.0.0",
-                    capabilities=server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={},
-                    ),
-                    icons=[_server_icon],
-                ),
+                _INIT_OPTS,
             )
     finally:
         stop_metrics_exporter()
@@ -289,4 +313,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Prefer uvloop's libuv event loop for the stdio transport
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -1,11 +1,10 @@
 import os
 import json
+import asyncio
 import httpx
 import logging
 from abc import ABC, abstractmethod
 from typing import override
-from openai import AsyncOpenAI
-import google.generativeai as genai
 
 from .models import ConsultationRequest, ConsultationResponse, ModelInfo, ProviderType, ServerConfig
 
@@ -35,13 +34,7 @@ class OllamaClient(AIClient):
     async def consult(self, request: ConsultationRequest) -> ConsultationResponse:
         url = f"{self.base_url}/chat"
         
-        messages = []
-        if request.messages:
-            messages = request.messages
-        else:
-            if request.system_prompt:
-                messages.append({"role": "system", "content": request.system_prompt})
-            messages.append({"role": "user", "content": request.query})
+        messages = request.to_messages()
 
         payload = {
             "model": request.model,
@@ -95,18 +88,15 @@ class OllamaClient(AIClient):
 
 class OpenAIClient(AIClient):
     def __init__(self, api_key: str | None = None, base_url: str | None = None, provider_label: ProviderType = "openai"):
+        # Deferred so Ollama-only setups don't pay for the OpenAI SDK import
+        from openai import AsyncOpenAI
+
         self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
         self.provider_label = provider_label
 
     @override
     async def consult(self, request: ConsultationRequest) -> ConsultationResponse:
-        messages = []
-        if request.messages:
-            messages = request.messages
-        else:
-            if request.system_prompt:
-                messages.append({"role": "system", "content": request.system_prompt})
-            messages.append({"role": "user", "content": request.query})
+        messages = request.to_messages()
 
         try:
             completion = await self.client.chat.completions.create(
@@ -145,8 +135,14 @@ class OpenAIClient(AIClient):
         except Exception:
             return False
 
+# Chat roles mapped to Gemini's history roles; system messages are handled separately
+_GEMINI_ROLES = {"user": "user", "assistant": "model"}
+
 class GoogleClient(AIClient):
     def __init__(self, api_key: str | None = None):
+        # Deferred so setups without Google don't pay for the grpc/protobuf import
+        import google.generativeai as genai
+
         if api_key:
             genai.configure(api_key=api_key)
         self.available = bool(api_key)
@@ -155,80 +151,45 @@ class GoogleClient(AIClient):
     async def consult(self, request: ConsultationRequest) -> ConsultationResponse:
         if not self.available:
             raise ValueError("Google API key not configured")
+
+        import google.generativeai as genai
         
         try:
             # Extract system instruction from request.system_prompt or first system message
             system_instruction = request.system_prompt
+            generation_config = genai.types.GenerationConfig(temperature=request.temperature)
             
             # If using messages, extract system instruction from system messages
             if request.messages:
-                # Separate system messages from conversation history
+                # Separate system messages from conversation history in a single pass
                 history = []
                 system_parts = []
                 
                 for msg in request.messages:
                     role = msg["role"]
-                    content = msg["content"]
-                    
                     if role == "system":
-                        # Collect all system messages
-                        system_parts.append(content)
-                    elif role == "user":
-                        history.append({"role": "user", "parts": [content]})
-                    elif role == "assistant":
-                        history.append({"role": "model", "parts": [content]})
+                        system_parts.append(msg["content"])
+                    elif role in _GEMINI_ROLES:
+                        history.append({"role": _GEMINI_ROLES[role], "parts": [msg["content"]]})
                 
                 # Combine system messages (request.system_prompt takes precedence)
-                if system_parts and not system_instruction:
+                if system_parts:
+                    if system_instruction:
+                        system_parts.insert(0, system_instruction)
                     system_instruction = "\n".join(system_parts)
-                elif system_parts and system_instruction:
-                    # Both exist: prepend request.system_prompt
-                    system_instruction = system_instruction + "\n" + "\n".join(system_parts)
                 
-                # Create model with system instruction if available
-                if system_instruction:
-                    model = genai.GenerativeModel(
-                        request.model,
-                        system_instruction=system_instruction
-                    )
-                else:
-                    model = genai.GenerativeModel(request.model)
+                # system_instruction=None is the SDK default, so one constructor covers both cases
+                model = genai.GenerativeModel(request.model, system_instruction=system_instruction)
                 
-                # Pop the last message if it's from user to use as the 'message' argument
-                if history and history[-1]["role"] == "user":
-                    current_msg = history.pop()
-                    chat = model.start_chat(history=history)
-                    resp = await chat.send_message_async(
-                        current_msg["parts"][0],
-                        generation_config=genai.types.GenerationConfig(
-                            temperature=request.temperature
-                        )
-                    )
-                else:
-                    # Fallback if no user message at end (shouldn't happen in normal flow)
-                    chat = model.start_chat(history=history)
-                    resp = await chat.send_message_async(
-                        request.query, # Fallback to explicit query param
-                        generation_config=genai.types.GenerationConfig(
-                            temperature=request.temperature
-                        )
-                    )
+                # Use the trailing user message as the 'message' argument; fall back to the
+                # explicit query if the history doesn't end with one (shouldn't happen in normal flow)
+                message = history.pop()["parts"][0] if history and history[-1]["role"] == "user" else request.query
+                chat = model.start_chat(history=history)
+                resp = await chat.send_message_async(message, generation_config=generation_config)
             else:
                 # Single-turn mode: use system_instruction parameter
-                if system_instruction:
-                    model = genai.GenerativeModel(
-                        request.model,
-                        system_instruction=system_instruction
-                    )
-                else:
-                    model = genai.GenerativeModel(request.model)
-                
-                resp = await model.generate_content_async(
-                    request.query,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=request.temperature
-                    )
-                )
+                model = genai.GenerativeModel(request.model, system_instruction=system_instruction)
+                resp = await model.generate_content_async(request.query, generation_config=generation_config)
 
             return ConsultationResponse(
                 provider="google",
@@ -244,14 +205,19 @@ class GoogleClient(AIClient):
     async def list_models(self) -> list[ModelInfo]:
         if not self.available:
             return []
+
+        import google.generativeai as genai
+
         try:
-            # genai.list_models is synchronous iterator, wrap or run in executor if needed.
-            # For this snippet, we'll iterate directly (it's fast enough usually).
-            models = []
-            for m in genai.list_models():
-                if 'generateContent' in m.supported_generation_methods:
-                    models.append(ModelInfo(id=m.name.replace("models/", ""), provider="google", description=m.description))
-            return models
+            # genai.list_models is a synchronous iterator backed by a network call,
+            # so drain it in a worker thread to keep the event loop responsive.
+            raw_models = await asyncio.to_thread(
+                lambda: [m for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+            )
+            return [
+                ModelInfo(id=m.name.replace("models/", ""), provider="google", description=m.description)
+                for m in raw_models
+            ]
         except Exception as e:
             logger.warning(f"Failed to list Google models: {e}")
             return []
@@ -265,8 +231,10 @@ class ClientFactory:
 
     @classmethod
     def get_client(cls, provider: ProviderType, config: ServerConfig) -> AIClient:
-        if provider in cls._instances:
-            return cls._instances[provider]
+        # Clients are built once per provider and reused for every tool call
+        cached = cls._instances.get(provider)
+        if cached is not None:
+            return cached
         
         client: AIClient
         p_config = config.providers.get(provider)
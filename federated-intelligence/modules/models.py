@@ -1,27 +1,51 @@
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from typing import Literal, Any
 import os
 import yaml
 from pathlib import Path
 import logging
 
+from utils import utc_now_iso
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 logger = logging.getLogger(__name__)
 
 ProviderType = Literal["ollama", "openai", "openrouter", "google"]
 
-@dataclass
+@dataclass(slots=True)
 class ProviderConfig:
     enabled: bool = False
     base_url: str | None = None
     default_model: str | None = None
     api_key: str | None = None
 
-@dataclass
+@dataclass(slots=True)
+class SessionsConfig:
+    # Most recent session messages sent to the provider per turn (0 = whole history)
+    max_context: int = 32
+
+@dataclass(slots=True)
 class ServerConfig:
     logging_enabled: bool = False
+    # Maximum concurrent provider calls in consult_multiple_models
+    max_parallel: int = 8
     defaults: dict[str, Any] = field(default_factory=dict)
     providers: dict[str, ProviderConfig] = field(default_factory=dict)
+    sessions: SessionsConfig = field(default_factory=SessionsConfig)
+
+def _number(value: Any, default: int | float, name: str, cast: type = int) -> int | float:
+    """Convert a config value with `cast`, falling back to `default` (with a warning) if it is unset or invalid."""
+    if value is None or value == "":
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid {name} value {value!r}, using {default}")
+        return default
 
 def load_config(config_path: Path | None = None) -> ServerConfig:
     """Load config from YAML with environment overrides."""
@@ -31,7 +55,7 @@ def load_config(config_path: Path | None = None) -> ServerConfig:
     if path.exists():
         try:
             with open(path) as f:
-                raw_config = yaml.safe_load(f) or {}
+                raw_config = yaml.load(f, Loader=_Loader) or {}
         except Exception as e:
             logger.warning(f"Failed to load config.yaml: {e}")
 
@@ -40,6 +64,9 @@ def load_config(config_path: Path | None = None) -> ServerConfig:
     if os.getenv("MCP_LOGGING_ENABLED") is not None:
         logging_enabled = os.getenv("MCP_LOGGING_ENABLED").lower() in ("true", "1", "yes")
 
+    max_parallel = _number(raw_config.get("max_parallel"), 8, "max_parallel")
+    max_parallel = _number(os.getenv("MCP_MAX_PARALLEL"), max_parallel, "MCP_MAX_PARALLEL")
+
     defaults = raw_config.get("defaults", {})
     providers_data = raw_config.get("providers", {})
     
@@ -70,12 +97,24 @@ def load_config(config_path: Path | None = None) -> ServerConfig:
             api_key=api_key
         )
 
-    return ServerConfig(logging_enabled=logging_enabled, defaults=defaults, providers=providers)
+    sessions_data = raw_config.get("sessions") or {}
+    sessions = SessionsConfig(
+        max_context=_number(sessions_data.get("max_context"), 32, "sessions.max_context"),
+    )
+    sessions.max_context = _number(os.getenv("MCP_SESSIONS_MAX_CONTEXT"), sessions.max_context, "MCP_SESSIONS_MAX_CONTEXT")
+
+    return ServerConfig(
+        logging_enabled=logging_enabled,
+        max_parallel=max_parallel,
+        defaults=defaults,
+        providers=providers,
+        sessions=sessions
+    )
 
 # Global config
 CONFIG = load_config()
 
-@dataclass
+@dataclass(slots=True)
 class ConsultationRequest:
     provider: ProviderType
     model: str
@@ -85,15 +124,26 @@ class ConsultationRequest:
     session_id: str | None = None
     messages: list[dict[str, str]] | None = None
 
-@dataclass
+    def to_messages(self) -> list[dict[str, str]]:
+        """Return chat messages, building them from system_prompt/query if none were given."""
+        if self.messages:
+            return self.messages
+        if self.system_prompt:
+            return [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self.query},
+            ]
+        return [{"role": "user", "content": self.query}]
+
+@dataclass(slots=True)
 class ConsultationResponse:
     provider: ProviderType
     model: str
     response: str
-    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: str = field(default_factory=utc_now_iso)
     metadata: dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class ModelInfo:
     id: str
     provider: ProviderType
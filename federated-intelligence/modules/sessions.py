@@ -1,34 +1,227 @@
-import json
+import os
 import uuid
+import atexit
+import orjson
 import logging
+import threading
+from collections import OrderedDict
+from operator import itemgetter
 from pathlib import Path
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from utils import utc_now_iso
+
 logger = logging.getLogger(__name__)
 
+# Number of recently used sessions kept in memory by SessionManager
+SESSION_CACHE_SIZE = 128
+
+# Summary of every stored session, so list_sessions doesn't open each session file
+INDEX_FILENAME = "index.json"
+
 @dataclass
 class Message:
     role: str
     content: str
-    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: str = field(default_factory=utc_now_iso)
+
+    def to_dict(self) -> dict[str, str]:
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
 
 @dataclass
 class Session:
     id: str
     messages: list[Message] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = field(default_factory=utc_now_iso)
+    updated_at: str = field(default_factory=utc_now_iso)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Appended messages not yet written to the JSONL file
+    pending: list[Message] = field(default_factory=list, repr=False, compare=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "metadata": self.metadata,
+            "messages": [m.to_dict() for m in self.messages],
+        }
 
 class SessionManager:
+    """
+    Persists chat sessions as two files per session:
+
+    - ``<id>.meta.json``: id, timestamps and metadata (rewritten on save)
+    - ``<id>.jsonl``: one message per line (appended on flush)
+
+    plus an ``index.json`` summary of all sessions used by list_sessions.
+    The index is a cache of the flushed JSONL state: it is written when a
+    session is created, kept current in memory on flush, and reconciled
+    against the JSONL file sizes on load.
+
+    Appended messages are buffered until the caller calls ``flush()`` (once per
+    tool call, so a turn's messages go out in one append); anything still
+    buffered is flushed on cache eviction and at interpreter exit.
+    """
+
     def __init__(self, storage_dir: Path):
         self.storage_dir = storage_dir
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        # LRU of loaded sessions so multi-turn chats don't re-parse the file every turn
+        self._cache: OrderedDict[str, Session] = OrderedDict()
+        # Methods are called from worker threads (asyncio.to_thread), so guard the LRU
+        self._cache_lock = threading.Lock()
+        self._migrate_legacy_sessions()
+        self._index_lock = threading.Lock()
+        self._index = self._load_index()
+        self._flush_lock = threading.Lock()
+        atexit.register(self.flush)
 
-    def _get_path(self, session_id: str) -> Path:
-        return self.storage_dir / f"{session_id}.json"
+    def _meta_path(self, session_id: str) -> Path:
+        return self.storage_dir / f"{session_id}.meta.json"
+
+    def _messages_path(self, session_id: str) -> Path:
+        return self.storage_dir / f"{session_id}.jsonl"
+
+    def _remember(self, session: Session, keep_existing: bool = False) -> Session:
+        """
+        Cache `session` and return the cached instance. With `keep_existing`, a
+        session already cached under the same id wins (e.g. a concurrent load).
+        """
+        evicted = None
+        with self._cache_lock:
+            if keep_existing:
+                session = self._cache.setdefault(session.id, session)
+            else:
+                self._cache[session.id] = session
+            self._cache.move_to_end(session.id)
+            if len(self._cache) > SESSION_CACHE_SIZE:
+                _, evicted = self._cache.popitem(last=False)
+        if evicted is not None and evicted.pending:
+            self._flush_session(evicted)
+        return session
+
+    def _migrate_legacy_sessions(self):
+        """Convert single-file ``<id>.json`` sessions to the meta + JSONL layout."""
+        with os.scandir(self.storage_dir) as it:
+            legacy_paths = [
+                Path(entry.path) for entry in it
+                if entry.name.endswith(".json")
+                and not entry.name.endswith(".meta.json")
+                and entry.name != INDEX_FILENAME
+            ]
+        for path in legacy_paths:
+            try:
+                with open(path, 'rb') as f:
+                    data = orjson.loads(f.read())
+                session = Session(
+                    id=data['id'],
+                    messages=[Message(**m) for m in data.get('messages', [])],
+                    created_at=data.get('created_at'),
+                    updated_at=data.get('updated_at'),
+                    metadata=data.get('metadata', {})
+                )
+                self._write_session(session)
+                path.unlink()
+            except Exception as e:
+                logger.error(f"Failed to migrate legacy session file {path}: {e}")
+
+    @staticmethod
+    def _index_entry(session_id: str, created_at: str | None, message_count: int,
+                     last_message: Message | None, size: int) -> dict[str, Any]:
+        return {
+            "id": session_id,
+            "created_at": created_at,
+            "message_count": message_count,
+            "preview": last_message.content[:50] if last_message else "",
+            # Byte size of the JSONL file this entry was computed from
+            "size": size,
+        }
+
+    def _jsonl_size(self, session_id: str) -> int:
+        try:
+            return self._messages_path(session_id).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        path = self.storage_dir / INDEX_FILENAME
+        index: dict[str, dict[str, Any]] = {}
+        try:
+            with open(path, 'rb') as f:
+                index = orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to read session index, rebuilding: {e}")
+
+        # Reconcile with the session files: the index can lag the JSONL after a
+        # kill, so re-read only sessions whose file size no longer matches
+        suffix = ".meta.json"
+        with os.scandir(self.storage_dir) as it:
+            session_ids = {entry.name[:-len(suffix)] for entry in it if entry.name.endswith(suffix)}
+        changed = False
+        for session_id in index.keys() - session_ids:
+            del index[session_id]
+            changed = True
+        for session_id in session_ids:
+            entry = index.get(session_id)
+            size = self._jsonl_size(session_id)
+            if entry is not None and entry.get("size") == size:
+                continue
+            try:
+                if entry is not None:
+                    created_at = entry.get("created_at")
+                else:
+                    with open(self._meta_path(session_id), 'rb') as f:
+                        created_at = orjson.loads(f.read()).get('created_at')
+                messages = self._read_messages(session_id)
+            except Exception:
+                continue
+            index[session_id] = self._index_entry(
+                session_id, created_at, len(messages), messages[-1] if messages else None, size
+            )
+            changed = True
+        if changed:
+            self._write_index(index)
+        return index
+
+    def _write_index(self, index: dict[str, dict[str, Any]]):
+        path = self.storage_dir / INDEX_FILENAME
+        try:
+            # Atomic write: write to temp file then rename
+            temp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(orjson.dumps(index))
+            temp_path.replace(path)
+        except Exception as e:
+            logger.error(f"Failed to write session index: {e}")
+
+    def _update_index(self, session: Session):
+        messages = session.messages
+        entry = self._index_entry(
+            session.id, session.created_at, len(messages), messages[-1] if messages else None,
+            self._jsonl_size(session.id)
+        )
+        with self._index_lock:
+            self._index[session.id] = entry
+            self._write_index(self._index)
+
+    def _read_messages(self, session_id: str) -> list[Message]:
+        path = self._messages_path(session_id)
+        if not path.exists():
+            return []
+        with open(path, 'rb') as f:
+            return [Message(**orjson.loads(line)) for line in f if line.strip()]
+
+    def _write_session(self, session: Session):
+        meta = session.to_dict()
+        lines = b"".join(orjson.dumps(m) + b"\n" for m in meta.pop("messages"))
+        with open(self._meta_path(session.id), 'wb') as f:
+            f.write(orjson.dumps(meta))
+        with open(self._messages_path(session.id), 'wb') as f:
+            f.write(lines)
 
     def create_session(self, metadata: Optional[dict[str, Any]] = None) -> Session:
         session_id = str(uuid.uuid4())
@@ -37,58 +230,102 @@ class SessionManager:
         return session
 
     def get_session(self, session_id: str) -> Optional[Session]:
-        path = self._get_path(session_id)
+        with self._cache_lock:
+            cached = self._cache.get(session_id)
+            if cached is not None:
+                self._cache.move_to_end(session_id)
+                return cached
+
+        path = self._meta_path(session_id)
         if not path.exists():
             return None
-        
+
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
-            
-            # Reconstruct objects
-            messages = [Message(**m) for m in data.get('messages', [])]
-            return Session(
-                id=data['id'],
+            with open(path, 'rb') as f:
+                meta = orjson.loads(f.read())
+
+            # Reconstruct objects; the last appended message is the latest update
+            messages = self._read_messages(session_id)
+            session = Session(
+                id=meta['id'],
                 messages=messages,
-                created_at=data.get('created_at'),
-                updated_at=data.get('updated_at'),
-                metadata=data.get('metadata', {})
+                created_at=meta.get('created_at'),
+                updated_at=messages[-1].timestamp if messages else meta.get('updated_at'),
+                metadata=meta.get('metadata', {})
             )
+            # Another thread may have loaded the same session meanwhile; everyone
+            # must share one instance or appends to the loser are never flushed
+            return self._remember(session, keep_existing=True)
         except Exception as e:
             logger.error(f"Failed to load session {session_id}: {e}")
             return None
 
     def save_session(self, session: Session):
-        path = self._get_path(session.id)
-        session.updated_at = datetime.now(timezone.utc).isoformat()
+        """Write the full session (meta and every message) to disk."""
+        session.updated_at = utc_now_iso()
+        self._remember(session)
+        # The full rewrite below includes any buffered messages
+        session.pending.clear()
         try:
-            # Ensure directory exists (safety check)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, 'w') as f:
-                json.dump(asdict(session), f, indent=2)
+            try:
+                self._write_session(session)
+            except FileNotFoundError:
+                # Storage dir was removed while running; __init__ created it once
+                self.storage_dir.mkdir(parents=True, exist_ok=True)
+                self._write_session(session)
         except Exception as e:
             logger.error(f"Failed to save session {session.id}: {e}")
+        self._update_index(session)
 
     def add_message(self, session_id: str, role: str, content: str):
         session = self.get_session(session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
-        
-        session.messages.append(Message(role=role, content=content))
-        self.save_session(session)
+        self.append_message(session, role, content)
 
-    def list_sessions(self) -> list[dict[str, Any]]:
-        sessions = []
-        for path in self.storage_dir.glob("*.json"):
+    def append_message(self, session: Session, role: str, content: str):
+        """Append a message to an already-loaded session; it is written on the next flush()."""
+        message = Message(role=role, content=content)
+        session.messages.append(message)
+        session.updated_at = message.timestamp
+        session.pending.append(message)
+
+    def _flush_session(self, session: Session):
+        with self._flush_lock:
+            pending, session.pending = session.pending, []
+            if not pending:
+                return
             try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                    sessions.append({
-                        "id": data['id'],
-                        "created_at": data.get('created_at'),
-                        "message_count": len(data.get('messages', [])),
-                        "preview": data['messages'][-1]['content'][:50] if data.get('messages') else ""
-                    })
-            except Exception:
-                continue
-        return sorted(sessions, key=lambda x: x['created_at'], reverse=True)
+                # Append only the new messages instead of rewriting the whole history
+                with open(self._messages_path(session.id), 'ab') as f:
+                    f.write(b"".join(orjson.dumps(m.to_dict()) + b"\n" for m in pending))
+                    size = f.tell()
+            except Exception as e:
+                logger.error(f"Failed to append messages to session {session.id}: {e}")
+                return
+            # Index entries describe what is on disk, so update only after the append
+            with self._index_lock:
+                entry = self._index.get(session.id)
+                if entry is not None:
+                    entry["message_count"] += len(pending)
+                    entry["preview"] = pending[-1].content[:50]
+                    entry["size"] = size
+
+    def flush(self, session_id: str | None = None):
+        """Write buffered messages for one session, or for every cached session."""
+        with self._cache_lock:
+            if session_id is None:
+                sessions = [s for s in self._cache.values() if s.pending]
+            else:
+                session = self._cache.get(session_id)
+                sessions = [session] if session is not None and session.pending else []
+        for session in sessions:
+            self._flush_session(session)
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        with self._index_lock:
+            sessions = [
+                {key: value for key, value in entry.items() if key != "size"}
+                for entry in self._index.values()
+            ]
+        return sorted(sessions, key=itemgetter('created_at'), reverse=True)
@@ -1,6 +1,7 @@
-import json
+import orjson
 import logging
 import asyncio
+from functools import lru_cache
 from pathlib import Path
 from mcp.types import Tool, TextContent
 from mcp.server import Server
@@ -20,7 +21,7 @@ session_manager = SessionManager(Path(__file__).parent.parent / "_logs" / "sessi
 
 def _ok(**payload) -> list[TextContent]:
     """Return a success response (standardized with result wrapper)."""
-    return [TextContent(type="text", text=json.dumps({"status": "success", "result": payload}))]
+    return [TextContent(type="text", text=orjson.dumps({"status": "success", "result": payload}).decode())]
 
 
 def _err(error: str, message: str | None = None, **details) -> list[TextContent]:
@@ -30,7 +31,13 @@ def _err(error: str, message: str | None = None, **details) -> list[TextContent]
         payload["message"] = message
     if details:
         payload["details"] = details
-    return [TextContent(type="text", text=json.dumps(payload))]
+    return [TextContent(type="text", text=orjson.dumps(payload).decode())]
+
+
+@lru_cache(maxsize=64)
+def _unknown_tool(name: str) -> list[TextContent]:
+    """Return the unknown_tool error for `name`, built once per name (do not mutate)."""
+    return _err("unknown_tool", f"Unknown tool: {name}")
 
 async def tool_consult_model(args: dict) -> list[TextContent]:
     """
@@ -54,16 +61,22 @@ async def tool_consult_model(args: dict) -> list[TextContent]:
         
         messages = None
         if session_id:
-            session = session_manager.get_session(session_id)
+            session = await asyncio.to_thread(session_manager.get_session, session_id)
             if not session:
                 return _err("session_not_found", f"Session {session_id} not found. Use 'create_session' to start a new session.", session_id=session_id)
             
             # Add user message to session
-            session_manager.add_message(session_id, "user", query)
+            await asyncio.to_thread(session_manager.append_message, session, "user", query)
             
             # Prepare messages for client
-            # Convert session messages to list of dicts
-            messages = [{"role": m.role, "content": m.content} for m in session.messages]
+            # Convert only the most recent session messages to list of dicts
+            max_context = CONFIG.sessions.max_context
+            start = max(0, len(session.messages) - max_context) if max_context > 0 else 0
+            # Start the window on a user turn (Gemini rejects contents that begin with a model turn)
+            while start < len(session.messages) - 1 and session.messages[start].role != "user":
+                start += 1
+            history = session.messages[start:]
+            messages = [{"role": m.role, "content": m.content} for m in history]
             
             # If system prompt provided, prepend it (override session system prompt? or just add?)
             # Usually system prompt is static. Let's assume if provided in args, it's the system prompt.
@@ -86,11 +99,13 @@ async def tool_consult_model(args: dict) -> list[TextContent]:
         response = await client.consult(req)
         
         # Log to file
-        log_consultation(req, response)
+        await asyncio.to_thread(log_consultation, req, response)
         
         # Update session with response
         if session_id:
-            session_manager.add_message(session_id, "assistant", response.response)
+            await asyncio.to_thread(session_manager.append_message, session, "assistant", response.response)
+            # Persist the finished turn now; MCP hosts stop the server with SIGTERM, which skips atexit
+            await asyncio.to_thread(session_manager.flush, session_id)
             return _ok(
                 session_id=session_id,
                 response=response.response,
@@ -108,6 +123,9 @@ async def tool_consult_model(args: dict) -> list[TextContent]:
         
     except Exception as e:
         logger.error(f"Consultation failed: {e}")
+        if session_id:
+            # Keep the user turn that was already buffered
+            await asyncio.to_thread(session_manager.flush, session_id)
         return _err("consultation_failed", f"Consultation failed: {str(e)}", provider=provider, model=model)
 
 async def tool_consult_multiple_models(args: dict) -> list[TextContent]:
@@ -116,50 +134,53 @@ async def tool_consult_multiple_models(args: dict) -> list[TextContent]:
     """
     models_config: list[dict] = args["models"] # List of {provider, model}
     query: str = args["query"]
+    # Cap in-flight provider calls so large fan-outs don't exhaust connection pools
+    semaphore = asyncio.Semaphore(max(1, CONFIG.max_parallel))
     
     async def consult_one(cfg):
-        provider = cfg["provider"]
-        model = cfg.get("model")
-        # Fallback default
-        if not model:
-            model = CONFIG.providers.get(provider).default_model
+        async with semaphore:
+            provider = cfg["provider"]
+            model = cfg.get("model")
+            # Fallback default
+            if not model:
+                model = CONFIG.providers.get(provider).default_model
             
-        try:
-            client = ClientFactory.get_client(provider, CONFIG)
-            req = ConsultationRequest(
-                provider=provider,
-                model=model,
-                query=query,
-                temperature=args.get("temperature")
-            )
-            resp = await client.consult(req)
-            log_consultation(req, resp)
-            return {
-                "provider": provider,
-                "model": model,
-                "response": resp.response,
-                "success": True
-            }
-        except Exception as e:
-            logger.error(f"Consultation failed for {provider}/{model}: {e}")
-            return {
-                "provider": provider,
-                "model": model,
-                "error": str(e),
-                "success": False
-            }
+            try:
+                client = ClientFactory.get_client(provider, CONFIG)
+                req = ConsultationRequest(
+                    provider=provider,
+                    model=model,
+                    query=query,
+                    temperature=args.get("temperature")
+                )
+                resp = await client.consult(req)
+                await asyncio.to_thread(log_consultation, req, resp)
+                return {
+                    "provider": provider,
+                    "model": model,
+                    "response": resp.response,
+                    "success": True
+                }
+            except Exception as e:
+                logger.error(f"Consultation failed for {provider}/{model}: {e}")
+                return {
+                    "provider": provider,
+                    "model": model,
+                    "error": str(e),
+                    "success": False
+                }
 
     results = await asyncio.gather(*[consult_one(cfg) for cfg in models_config])
     return _ok(results=results)
 
 async def tool_create_session(args: dict) -> list[TextContent]:
     """Create a new chat session."""
-    session = session_manager.create_session(metadata=args.get("metadata"))
+    session = await asyncio.to_thread(session_manager.create_session, args.get("metadata"))
     return _ok(session_id=session.id, created_at=session.created_at)
 
 async def tool_list_sessions(args: dict) -> list[TextContent]:
     """List active sessions."""
-    sessions = session_manager.list_sessions()
+    sessions = await asyncio.to_thread(session_manager.list_sessions)
     return _ok(sessions=sessions, count=len(sessions))
 
 
@@ -225,124 +246,127 @@ TOOL_HANDLERS = {
     "health_check": tool_health_check
 }
 
-def register_tools(server: Server):
-    @server.list_tools()
-    async def handle_list_tools() -> list[Tool]:
-        return [
-            Tool(
-                name="consult_model",
-                description="Consult an external AI model (Ollama, OpenAI, Google, OpenRouter). Supports sessions.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "provider": {
-                            "type": "string",
-                            "enum": ["ollama", "openai", "openrouter", "google"],
-                            "description": "The AI provider to use."
-                        },
-                        "model": {
-                            "type": "string",
-                            "description": "The model name (e.g., 'llama3', 'gpt-4'). Optional if default is set."
-                        },
-                        "query": {
-                            "type": "string",
-                            "description": "The query or prompt to send to the model."
-                        },
-                        "system_prompt": {
-                            "type": "string",
-                            "description": "Optional system prompt to set context."
-                        },
-                        "temperature": {
-                            "type": "number",
-                            "description": "Sampling temperature (0.0 to 1.0)."
-                        },
-                        "session_id": {
-                            "type": "string",
-                            "description": "Session ID to continue a conversation. Use 'new' to start a new session."
-                        }
-                    },
-                    "required": ["provider", "query"]
+# Static literals, so the models are built without re-running Pydantic validation
+TOOLS = (
+    Tool.model_construct(
+        name="consult_model",
+        description="Consult an external AI model (Ollama, OpenAI, Google, OpenRouter). Supports sessions.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "provider": {
+                    "type": "string",
+                    "enum": ["ollama", "openai", "openrouter", "google"],
+                    "description": "The AI provider to use."
+                },
+                "model": {
+                    "type": "string",
+                    "description": "The model name (e.g., 'llama3', 'gpt-4'). Optional if default is set."
+                },
+                "query": {
+                    "type": "string",
+                    "description": "The query or prompt to send to the model."
+                },
+                "system_prompt": {
+                    "type": "string",
+                    "description": "Optional system prompt to set context."
+                },
+                "temperature": {
+                    "type": "number",
+                    "description": "Sampling temperature (0.0 to 1.0)."
+                },
+                "session_id": {
+                    "type": "string",
+                    "description": "Session ID to continue a conversation. Use 'new' to start a new session."
                 }
-            ),
-            Tool(
-                name="consult_multiple_models",
-                description="Consult multiple models in parallel with the same query.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "models": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "provider": {"type": "string", "enum": ["ollama", "openai", "openrouter", "google"]},
-                                    "model": {"type": "string"}
-                                },
-                                "required": ["provider"]
-                            },
-                            "description": "List of models to consult."
-                        },
-                        "query": {
-                            "type": "string",
-                            "description": "The query to send to all models."
+            },
+            "required": ["provider", "query"]
+        }
+    ),
+    Tool.model_construct(
+        name="consult_multiple_models",
+        description="Consult multiple models in parallel with the same query.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "models": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "provider": {"type": "string", "enum": ["ollama", "openai", "openrouter", "google"]},
+                            "model": {"type": "string"}
                         },
-                        "temperature": {
-                            "type": "number",
-                            "description": "Sampling temperature."
-                        }
+                        "required": ["provider"]
                     },
-                    "required": ["models", "query"]
+                    "description": "List of models to consult."
+                },
+                "query": {
+                    "type": "string",
+                    "description": "The query to send to all models."
+                },
+                "temperature": {
+                    "type": "number",
+                    "description": "Sampling temperature."
                 }
-            ),
-            Tool(
-                name="create_session",
-                description="Create a new chat session.",
-                inputSchema={
+            },
+            "required": ["models", "query"]
+        }
+    ),
+    Tool.model_construct(
+        name="create_session",
+        description="Create a new chat session.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "metadata": {
                     "type": "object",
-                    "properties": {
-                        "metadata": {
-                            "type": "object",
-                            "description": "Optional metadata for the session."
-                        }
-                    }
+                    "description": "Optional metadata for the session."
                 }
-            ),
-            Tool(
-                name="list_sessions",
-                description="List active chat sessions.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            ),
-            Tool(
-                name="list_models",
-                description="List available models for a specific provider.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "provider": {
-                            "type": "string",
-                            "enum": ["ollama", "openai", "openrouter", "google"],
-                            "description": "The provider to list models for."
-                        }
-                    },
-                    "required": ["provider"]
-                }
-            ),
-            Tool(
-                name="health_check",
-                description="Check connectivity to enabled providers.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
+            }
+        }
+    ),
+    Tool.model_construct(
+        name="list_sessions",
+        description="List active chat sessions.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool.model_construct(
+        name="list_models",
+        description="List available models for a specific provider.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "provider": {
+                    "type": "string",
+                    "enum": ["ollama", "openai", "openrouter", "google"],
+                    "description": "The provider to list models for."
                 }
-            )
-        ]
+            },
+            "required": ["provider"]
+        }
+    ),
+    Tool.model_construct(
+        name="health_check",
+        description="Check connectivity to enabled providers.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    )
+)
+
+def register_tools(server: Server):
+    @server.list_tools()
+    async def handle_list_tools() -> tuple[Tool, ...]:
+        return TOOLS
 
     @server.call_tool()
     async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
         handler = TOOL_HANDLERS.get(name)
         if handler:
             return await handler(arguments)
-        return _err("unknown_tool", f"Unknown tool: {name}")
+        return _unknown_tool(name)
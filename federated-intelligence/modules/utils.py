@@ -1,20 +1,34 @@
-import json
+import atexit
 import logging
+import orjson
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, BinaryIO
+
+# Open handle to today's consultations log, reopened when the UTC date rolls over
+_log_lock = threading.Lock()
+_log_fp: BinaryIO | None = None
+_log_date: str | None = None
+
+def _close_consultation_log():
+    global _log_fp, _log_date
+    with _log_lock:
+        if _log_fp is not None:
+            _log_fp.close()
+        _log_fp = None
+        _log_date = None
+
+atexit.register(_close_consultation_log)
 
 def log_consultation(request: Any, response: Any):
     """Log consultation details to a JSONL file."""
-    log_dir = Path(__file__).parent.parent / "_logs"
-    log_dir.mkdir(exist_ok=True)
-    
-    filename = f"consultations-{datetime.now(timezone.utc).strftime('%Y%m%d')}.jsonl"
-    filepath = log_dir / filename
+    global _log_fp, _log_date
+    now = datetime.now(timezone.utc)
     
     entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now.isoformat(),
         "request": {
             "provider": request.provider,
             "model": request.model,
@@ -29,7 +43,17 @@ def log_consultation(request: Any, response: Any):
     }
     
     try:
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        line = orjson.dumps(entry) + b"\n"
+        date = now.strftime('%Y%m%d')
+        with _log_lock:
+            if _log_fp is None or _log_date != date:
+                if _log_fp is not None:
+                    _log_fp.close()
+                log_dir = Path(__file__).parent.parent / "_logs"
+                log_dir.mkdir(exist_ok=True)
+                # Unbuffered so each entry reaches the file with a single write()
+                _log_fp = open(log_dir / f"consultations-{date}.jsonl", "ab", buffering=0)
+                _log_date = date
+            _log_fp.write(line)
     except Exception as e:
         print(f"Failed to write to log file: {e}", file=sys.stderr)
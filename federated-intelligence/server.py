@@ -13,13 +13,13 @@ from mcp.server.stdio import stdio_server
 from mcp.types import Icon
 from modules.tools import register_tools
 from modules.models import CONFIG
-from utils import setup_logging
+from utils import icon_src, setup_logging
 
 # Initialize Server
-# Create icon from SVG file using file:// URI
+# Create icon from SVG file, inlined as a data: URI (file:// if unreadable)
 _icon_path = Path(__file__).parent / "assets" / "icon.svg"
 _server_icon = Icon(
-    src=f"file://{_icon_path.resolve()}",
+    src=icon_src(_icon_path),
     mimeType="image/svg+xml",
 )
 
@@ -28,6 +28,20 @@ server = Server(
     icons=[_server_icon],
 )
 
+# Register tools
+register_tools(server)
+
+# Built once, after the tools are registered (capabilities reflect them)
+_INIT_OPTS = InitializationOptions(
+    server_name="Federated Intelligence",
+    server_version="0.1.0",
+    capabilities=server.get_capabilities(
+        notification_options=NotificationOptions(),
+        experimental_capabilities={},
+    ),
+    icons=[_server_icon],
+)
+
 logger = logging.getLogger(__name__)
 
 async def main():
@@ -38,23 +52,18 @@ async def main():
     else:
         logging.disable(logging.CRITICAL)
 
-    # Register tools
-    register_tools(server)
-    
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
             write_stream,
-            InitializationOptions(
-                server_name="Federated Intelligence",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-                icons=[_server_icon],
-            ),
+            _INIT_OPTS,
         )
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Prefer uvloop's libuv event loop for the stdio transport and parallel consultations
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -4,16 +4,61 @@ Lateral Synthesis MCP - Divergence Strategies
 Pluggable strategies for generating divergent concepts.
 """
 
-import json
 import logging
 import random
+import threading
 from abc import ABC, abstractmethod
+from functools import lru_cache, partial
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+_HERE = Path(__file__).parent
+
 # Path to concepts data file
-CONCEPTS_FILE = Path(__file__).parent.parent / "data" / "concepts.json"
+CONCEPTS_FILE = _HERE.parent / "data" / "concepts.json"
+
+# Parsed concepts.json word list, loaded once per process by _get_fallback_words()
+_CACHED_FALLBACK_WORDS: list[str] | None = None
+_FALLBACK_WORDS_LOCK = threading.Lock()
+
+
+def _load_concepts_file() -> list[str]:
+    """Load word list from concepts.json."""
+    try:
+        data = orjson.loads(CONCEPTS_FILE.read_bytes())
+        
+        fallback = data.get("fallback_words", {})
+        words = []
+        for category in [
+            "nouns",
+            "verbs",
+            "adjectives",
+            "abstract",
+            "phrases",
+            "numbers",
+            "equations",
+        ]:
+            words.extend(fallback.get(category, []))
+        return words
+    except FileNotFoundError:
+        logger.warning(f"concepts.json not found at {CONCEPTS_FILE}")
+        return []
+    except Exception as e:
+        logger.warning(f"Failed to load concepts.json: {e}")
+        return []
+
+
+def _get_fallback_words() -> list[str]:
+    """Return the concepts.json word list, parsing the file on first use only."""
+    global _CACHED_FALLBACK_WORDS
+    if _CACHED_FALLBACK_WORDS is None:
+        with _FALLBACK_WORDS_LOCK:
+            if _CACHED_FALLBACK_WORDS is None:
+                _CACHED_FALLBACK_WORDS = _load_concepts_file()
+    return _CACHED_FALLBACK_WORDS
 
 # -----------------------------------------------------------------------------
 # Base Strategy
@@ -36,34 +81,63 @@ class DivergenceStrategy(ABC):
         """
         pass
     
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Strategy name for logging/config."""
-        pass
+    # Strategy name for logging/config
+    name: str
 
 
 # -----------------------------------------------------------------------------
 # Random Strategy (wonderwords)
 # -----------------------------------------------------------------------------
 
+# wonderwords parts of speech, used round-robin by slot position
+_WORD_TYPES = ("nouns", "verbs", "adjectives")
+
+
+@lru_cache(maxsize=64)
+def _mixing_schedule(count: int, with_fallback: bool) -> tuple[tuple[str | None, ...], dict[str | None, int]]:
+    """
+    Return the source of each of `count` slots and how many slots each source fills.
+    
+    Slots are a part of speech from _WORD_TYPES, or None for a concepts.json pick
+    (every fourth slot when `with_fallback`). Treat the returned dict as read-only.
+    """
+    slot_types = tuple(
+        None if with_fallback and i % 4 == 3 else _WORD_TYPES[i % len(_WORD_TYPES)]
+        for i in range(count)
+    )
+    type_counts = {pos: slot_types.count(pos) for pos in (None, *_WORD_TYPES)}
+    return slot_types, type_counts
+
+
 class RandomStrategy(DivergenceStrategy):
     """Generate random words with no relation to origin."""
     
+    name = "random"
+    
     def __init__(self):
         self._words = []
         self._source = "unknown"
+        # Own generator so draws skip the random module's shared-instance shims
+        self._rng = random.Random()
+        self._choices = self._rng.choices
         
         # 1. Try wonderwords (optional)
         try:
             from wonderwords import RandomWord
             self._rw = RandomWord()
             self._source = "wonderwords"
+            # Draw functions per part of speech, bound once instead of per call
+            self._batch_draws = {
+                pos: partial(self._rw.random_words, include_parts_of_speech=[pos]) for pos in _WORD_TYPES
+            }
+            self._word_draws = {
+                pos: partial(self._rw.word, include_parts_of_speech=[pos]) for pos in _WORD_TYPES
+            }
         except ImportError:
             self._rw = None
             
         # 2. Load concepts.json (primary fallback)
-        self._fallback_words = self._load_concepts_file()
+        self._fallback_words = _get_fallback_words()
         
         # If wonderwords failed, we rely on the file
         if not self._rw:
@@ -76,74 +150,51 @@ class RandomStrategy(DivergenceStrategy):
             self._source = "panic_fallback"
             logger.warning("Using panic fallback word list (concepts.json missing/empty)")
 
-    def _load_concepts_file(self) -> list[str]:
-        """Load word list from concepts.json."""
+        self.name = f"random ({self._source})"
+    
+    def _random_words(self, part_of_speech: str, amount: int) -> list[str]:
+        """Draw words of one part of speech, falling back to single draws if the batch fails."""
+        if amount == 0:
+            return []
         try:
-            if not CONCEPTS_FILE.exists():
-                logger.warning(f"concepts.json not found at {CONCEPTS_FILE}")
-                return []
-                
-            with open(CONCEPTS_FILE) as f:
-                data = json.load(f)
-            
-            fallback = data.get("fallback_words", {})
+            return self._batch_draws[part_of_speech](amount)
+        except Exception:
+            word_draw = self._word_draws[part_of_speech]
             words = []
-            for category in [
-                "nouns",
-                "verbs",
-                "adjectives",
-                "abstract",
-                "phrases",
-                "numbers",
-                "equations",
-            ]:
-                words.extend(fallback.get(category, []))
+            for _ in range(amount):
+                try:
+                    words.append(word_draw())
+                except Exception:
+                    # Fallback to list if wonderwords fails for some reason
+                    if self._fallback_words:
+                        words.append(self._rng.choice(self._fallback_words))
+                    else:
+                        words.append("unknown")
             return words
-        except Exception as e:
-            logger.warning(f"Failed to load concepts.json: {e}")
-            return []
-    
-    @property
-    def name(self) -> str:
-        return f"random ({self._source})"
     
     def generate(self, origin: str, count: int) -> list[str]:
         """Generate random words (true randomness)."""
-        logger.debug(f"Generating {count} random divergent concepts for origin: {origin[:20]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generating %d random divergent concepts for origin: %s...", count, origin[:20])
         
         # Use wonderwords if available, but occasionally sample from concepts.json
         # so we can emit phrases/numbers/equations too.
         if self._rw:
-            concepts: list[str] = []
-            word_types = ["noun", "verb", "adjective"]
-            for i in range(count):
-                use_fallback = bool(self._fallback_words) and (i % 4 == 3)
-                if use_fallback:
-                    concepts.append(random.choice(self._fallback_words))
-                    continue
-
-                word_type = word_types[i % len(word_types)]
-                try:
-                    if word_type == "noun":
-                        word = self._rw.word(include_parts_of_speech=["nouns"])
-                    elif word_type == "verb":
-                        word = self._rw.word(include_parts_of_speech=["verbs"])
-                    else:
-                        word = self._rw.word(include_parts_of_speech=["adjectives"])
-                    concepts.append(word)
-                except Exception:
-                    # Fallback to list if wonderwords fails for some reason
-                    if self._fallback_words:
-                        concepts.append(random.choice(self._fallback_words))
-                    else:
-                        concepts.append("unknown")
-            return concepts
+            slot_types, type_counts = _mixing_schedule(count, bool(self._fallback_words))
+            # Every fourth slot comes from concepts.json; draw those in one call
+            fallback_picks = (
+                iter(self._choices(self._fallback_words, k=type_counts[None]))
+                if type_counts[None] else None
+            )
+            # One wonderwords call per part of speech instead of one per word
+            batches = {pos: iter(self._random_words(pos, type_counts[pos])) for pos in _WORD_TYPES}
+            return [next(fallback_picks) if pos is None else next(batches[pos]) for pos in slot_types]
             
         # Otherwise use loaded list (concepts.json or panic fallback)
         if not self._words:
              return ["error"] * count # Should be covered by panic fallback in init
              
-        return [random.choice(self._words) for _ in range(count)]
+        return self._choices(self._words, k=count)
 
 
 # -----------------------------------------------------------------------------
@@ -154,6 +205,10 @@ STRATEGIES: dict[str, type[DivergenceStrategy]] = {
     "random": RandomStrategy,
 }
 
+# One shared instance per strategy class, built on first use
+_STRATEGY_INSTANCES: dict[type[DivergenceStrategy], DivergenceStrategy] = {}
+_STRATEGY_LOCK = threading.Lock()
+
 
 def get_strategy(method: str) -> DivergenceStrategy:
     """Get a divergence strategy by name."""
@@ -161,7 +216,13 @@ def get_strategy(method: str) -> DivergenceStrategy:
     if strategy_class is None:
         logger.warning(f"Unknown divergence method '{method}', using random")
         strategy_class = RandomStrategy
-    return strategy_class()
+    strategy = _STRATEGY_INSTANCES.get(strategy_class)
+    if strategy is None:
+        with _STRATEGY_LOCK:
+            strategy = _STRATEGY_INSTANCES.get(strategy_class)
+            if strategy is None:
+                strategy = _STRATEGY_INSTANCES[strategy_class] = strategy_class()
+    return strategy
 
 
 def generate_divergent_concepts(origin: str, method: str = "random", count: int = 5) -> list[str]:
@@ -177,7 +238,7 @@ def generate_divergent_concepts(origin: str, method: str = "random", count: int
         List of divergent concept strings
     """
     strategy = get_strategy(method)
-    logger.info(f"Generating {count} divergent concepts using '{strategy.name}' strategy")
+    logger.info("Generating %d divergent concepts using '%s' strategy", count, strategy.name)
     concepts = strategy.generate(origin, count)
-    logger.debug(f"Generated concepts: {concepts}")
+    logger.debug("Generated concepts: %s", concepts)
     return concepts
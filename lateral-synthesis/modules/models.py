@@ -4,17 +4,18 @@ Lateral Synthesis MCP - Data Models
 Dataclasses for sessions, syntheses, reflections, config, and global state.
 """
 
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 import logging
 import os
-import uuid
-import yaml
+
+from utils import utc_now_iso
 
 logger = logging.getLogger(__name__)
 
+_HERE = Path(__file__).parent
+
 # -----------------------------------------------------------------------------
 # Connection Types
 # -----------------------------------------------------------------------------
@@ -29,28 +30,31 @@ CONNECTION_TYPES = [
     "other",        # Requires connection_type_detail
 ]
 
+# Set form of CONNECTION_TYPES for validation lookups
+_CONNECTION_TYPES_SET = frozenset(CONNECTION_TYPES)
+
 # -----------------------------------------------------------------------------
 # Config
 # -----------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class DivergenceConfig:
     method: str = "random"
     count: int = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class PersistenceConfig:
     enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class LimitsConfig:
     max_origin_chars: int = 1000
     max_insight_chars: int = 2000
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     logging_enabled: bool = False
     divergence: DivergenceConfig = field(default_factory=DivergenceConfig)
@@ -58,18 +62,43 @@ class Config:
     limits: LimitsConfig = field(default_factory=LimitsConfig)
 
 
+# Parsed YAML per config path, reused while the file's mtime is unchanged
+_YAML_CACHE: dict[Path, tuple[int, dict[str, Any]]] = {}
+
+
+def _read_yaml(config_path: Path) -> dict[str, Any] | None:
+    """Parse a YAML file (None if missing), reusing the last parse if it hasn't changed."""
+    try:
+        mtime = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    cached = _YAML_CACHE.get(config_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    import yaml  # Deferred: only needed when a config file is present
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    
+    with open(config_path) as f:
+        data = yaml.load(f, Loader=Loader) or {}
+    _YAML_CACHE[config_path] = (mtime, data)
+    return data
+
+
 def load_config(config_path: Path | None = None) -> Config:
     """Load config from YAML file, with env var overrides."""
     if config_path is None:
-        config_path = Path(__file__).parent.parent / "config.yaml"
+        config_path = _HERE.parent / "config.yaml"
     
     cfg = Config()
     
-    if config_path.exists():
-        try:
-            with open(config_path) as f:
-                data = yaml.safe_load(f) or {}
-            
+    try:
+        data = _read_yaml(config_path)
+        if data is not None:
             if "divergence" in data:
                 cfg.divergence = DivergenceConfig(**data["divergence"])
             if "persistence" in data:
@@ -79,8 +108,8 @@ def load_config(config_path: Path | None = None) -> Config:
 
             if "logging_enabled" in data:
                 cfg.logging_enabled = bool(data["logging_enabled"])
-        except Exception as e:
-            logger.warning(f"Failed to load config from {config_path}: {e}")
+    except Exception as e:
+        logger.warning(f"Failed to load config from {config_path}: {e}")
     
     # Environment variable overrides
     if env_method := os.getenv("MCP_DIVERGENCE_METHOD"):
@@ -100,7 +129,7 @@ def load_config(config_path: Path | None = None) -> Config:
 # Session Models
 # -----------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class ConceptSynthesis:
     """Synthesis for a single divergent concept."""
     divergent_concept: str
@@ -108,12 +137,23 @@ class ConceptSynthesis:
     connection_type_detail: str | None  # Required if connection_type == "other"
     confidence: float  # 0.0 - 1.0
     insight: str
-    recorded_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    recorded_at: str = field(default_factory=utc_now_iso)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "divergent_concept": self.divergent_concept,
+            "connection_type": self.connection_type,
+            "connection_type_detail": self.connection_type_detail,
+            "confidence": self.confidence,
+            "insight": self.insight,
+            "recorded_at": self.recorded_at,
+        }
     
     def validate(self) -> list[str]:
         """Return list of validation errors, empty if valid."""
         errors = []
-        if self.connection_type not in CONNECTION_TYPES:
+        if self.connection_type not in _CONNECTION_TYPES_SET:
             errors.append(f"Invalid connection_type: {self.connection_type}. Must be one of {CONNECTION_TYPES}")
         if self.connection_type == "other" and not self.connection_type_detail:
             errors.append("connection_type_detail is required when connection_type is 'other'")
@@ -124,14 +164,24 @@ class ConceptSynthesis:
         return errors
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionReflection:
     """Meta-reflection after all syntheses are complete."""
     most_valuable_insight: str
     why_valuable: str
     surprising_connections: list[str]
     overall_rating: float  # 0.0 - 1.0
-    recorded_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    recorded_at: str = field(default_factory=utc_now_iso)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "most_valuable_insight": self.most_valuable_insight,
+            "why_valuable": self.why_valuable,
+            "surprising_connections": list(self.surprising_connections),
+            "overall_rating": self.overall_rating,
+            "recorded_at": self.recorded_at,
+        }
     
     def validate(self) -> list[str]:
         """Return list of validation errors, empty if valid."""
@@ -145,7 +195,7 @@ class SessionReflection:
         return errors
 
 
-@dataclass
+@dataclass(slots=True)
 class LateralSession:
     """A complete lateral synthesis session."""
     session_id: str
@@ -154,25 +204,54 @@ class LateralSession:
     syntheses: list[ConceptSynthesis] = field(default_factory=list)
     reflection: SessionReflection | None = None
     method: str = "random"
-    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created_at: str = field(default_factory=utc_now_iso)
     completed_at: str | None = None
+    # Set views of divergent_concepts and synthesized concepts, kept in step by
+    # set_divergent_concepts / add_synthesis / clear_syntheses
+    _divergent: frozenset[str] = field(default_factory=frozenset, init=False, repr=False, compare=False)
+    _synthesized: set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self._divergent = frozenset(self.divergent_concepts)
+        self._synthesized = {s.divergent_concept for s in self.syntheses}
     
     @classmethod
     def create(cls, origin: str, method: str = "random") -> "LateralSession":
         """Create a new session with a unique ID."""
+        import uuid
+
         return cls(
-            session_id=str(uuid.uuid4()),
+            session_id=uuid.uuid4().hex,
             origin=origin,
             method=method,
         )
     
+    def set_divergent_concepts(self, concepts: list[str]) -> None:
+        """Replace the divergent concepts for this session."""
+        self.divergent_concepts = concepts
+        self._divergent = frozenset(concepts)
+    
+    def has_divergent_concept(self, concept: str) -> bool:
+        """Check if a concept is one of this session's divergent concepts."""
+        return concept in self._divergent
+    
+    def add_synthesis(self, synthesis: ConceptSynthesis) -> None:
+        """Append a synthesis and mark its divergent concept as synthesized."""
+        self.syntheses.append(synthesis)
+        self._synthesized.add(synthesis.divergent_concept)
+    
+    def clear_syntheses(self) -> None:
+        """Drop all recorded syntheses."""
+        self.syntheses = []
+        self._synthesized.clear()
+    
     def get_synthesized_concepts(self) -> set[str]:
-        """Return set of divergent concepts that have been synthesized."""
-        return {s.divergent_concept for s in self.syntheses}
+        """Return set of divergent concepts that have been synthesized (do not mutate)."""
+        return self._synthesized
     
     def get_remaining_concepts(self) -> list[str]:
         """Return list of divergent concepts not yet synthesized."""
-        synthesized = self.get_synthesized_concepts()
+        synthesized = self._synthesized
         return [c for c in self.divergent_concepts if c not in synthesized]
     
     def is_synthesis_complete(self) -> bool:
@@ -188,9 +267,9 @@ class LateralSession:
         return {
             "session_id": self.session_id,
             "origin": self.origin,
-            "divergent_concepts": self.divergent_concepts,
-            "syntheses": [asdict(s) for s in self.syntheses],
-            "reflection": asdict(self.reflection) if self.reflection else None,
+            "divergent_concepts": list(self.divergent_concepts),
+            "syntheses": [s.to_dict() for s in self.syntheses],
+            "reflection": self.reflection.to_dict() if self.reflection else None,
             "method": self.method,
             "created_at": self.created_at,
             "completed_at": self.completed_at,
@@ -204,12 +283,12 @@ class LateralSession:
             origin=data["origin"],
             divergent_concepts=data.get("divergent_concepts", []),
             method=data.get("method", "random"),
-            created_at=data.get("created_at", datetime.now(timezone.utc).isoformat()),
+            created_at=data.get("created_at", utc_now_iso()),
             completed_at=data.get("completed_at"),
         )
         
         for s in data.get("syntheses", []):
-            session.syntheses.append(ConceptSynthesis(**s))
+            session.add_synthesis(ConceptSynthesis(**s))
         
         if data.get("reflection"):
             session.reflection = SessionReflection(**data["reflection"])
@@ -227,6 +306,9 @@ SESSIONS: dict[str, LateralSession] = {}
 # Current session ID for convenience
 CURRENT_SESSION_ID: str | None = None
 
+# Resolved current session; set_current_session must be called again if it leaves SESSIONS
+_CURRENT_SESSION: LateralSession | None = None
+
 # Loaded config
 CONFIG: Config | None = None
 
@@ -241,13 +323,12 @@ def get_config() -> Config:
 
 def set_current_session(session_id: str | None) -> None:
     """Set the current active session."""
-    global CURRENT_SESSION_ID
+    global CURRENT_SESSION_ID, _CURRENT_SESSION
     CURRENT_SESSION_ID = session_id
-    logger.debug(f"Current session set to: {session_id}")
+    _CURRENT_SESSION = SESSIONS.get(session_id) if session_id else None
+    logger.debug("Current session set to: %s", session_id)
 
 
 def get_current_session() -> LateralSession | None:
     """Get the current active session."""
-    if CURRENT_SESSION_ID and CURRENT_SESSION_ID in SESSIONS:
-        return SESSIONS[CURRENT_SESSION_ID]
-    return None
+    return _CURRENT_SESSION
@@ -4,126 +4,285 @@ Lateral Synthesis MCP - Persistence
 Handles saving and loading sessions from disk.
 """
 
-import json
+import atexit
+import heapq
 import logging
+import mmap
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from datetime import datetime, timezone
+
+import orjson
+
+from utils import utc_now_iso
 
 from .models import LateralSession, get_config
 
 logger = logging.getLogger(__name__)
 
+# Logs dir is inside the lateral-synthesis folder
+_LOGS_DIR = Path(__file__).parent.parent / "_logs"
+
+# Single append-only event log shared by all sessions (records carry session_id)
+EVENTS_FILENAME = "lateral-synthesis-events.jsonl"
+
+# Completed sessions: lateral-synthesis-session-<timestamp>-<id prefix>.jsonl
+HISTORY_PREFIX = "lateral-synthesis-session-"
+
+# config.persistence.enabled, read on first use (config is loaded once per process)
+_PERSISTENCE_ENABLED: bool | None = None
+
+# Last session parsed from each history file, reused while (mtime_ns, size) is unchanged
+_SESSION_CACHE: dict[str, tuple[int, int, LateralSession | None]] = {}
+
 def get_logs_dir() -> Path:
     """Get the path to the logs directory."""
-    # Logs dir is inside the lateral-synthesis folder
-    return Path(__file__).parent.parent / "_logs"
+    return _LOGS_DIR
+
+
+class SnapshotWriter:
+    """
+    Appends JSONL records from a background thread.
+    
+    Records queued within `interval` seconds of each other (up to `max_batch`)
+    are grouped by file and written with one os.write per file. Files are kept
+    open (O_APPEND) until close().
+    """
+    
+    def __init__(self, max_batch: int = 256, interval: float = 0.05):
+        self._queue: queue.SimpleQueue[tuple[Path, bytes] | None] = queue.SimpleQueue()
+        self._max_batch = max_batch
+        self._interval = interval
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # Append-mode descriptors, only touched by the writer thread
+        self._fds: dict[Path, int] = {}
+    
+    def enqueue(self, path: Path, record: bytes) -> None:
+        """Queue an already-encoded record (including its newline) for appending to `path`."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                    self._thread.start()
+        self._queue.put((path, record))
+    
+    def close(self) -> None:
+        """Write everything still queued and stop the writer thread."""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+    
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self._interval
+            while len(batch) < self._max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+    
+    def _write(self, batch: list[tuple[Path, bytes]]) -> None:
+        by_path: dict[Path, list[bytes]] = {}
+        for path, record in batch:
+            by_path.setdefault(path, []).append(record)
+        for path, records in by_path.items():
+            try:
+                fd = self._fds.get(path)
+                if fd is None:
+                    fd = self._fds[path] = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                data = memoryview(b"".join(records))
+                while data:
+                    data = data[os.write(fd, data):]
+            except Exception as e:
+                logger.debug(f"Failed to write session log: {e}")
+
+
+SNAPSHOT_WRITER = SnapshotWriter()
+atexit.register(SNAPSHOT_WRITER.close)
+
 
+def _persistence_enabled() -> bool:
+    global _PERSISTENCE_ENABLED
+    if _PERSISTENCE_ENABLED is None:
+        _PERSISTENCE_ENABLED = get_config().persistence.enabled
+    return _PERSISTENCE_ENABLED
 
-def save_session_to_history(session: LateralSession) -> None:
-    """Save a completed session to a new log file."""
-    config = get_config()
-    if not config.persistence.enabled:
+
+def save_session_to_history(session_data: dict) -> None:
+    """
+    Save a completed session to a new log file.
+    
+    Takes the session's to_dict() snapshot rather than the live session, so it
+    can run in a worker thread while the event loop keeps mutating the session.
+    """
+    if not _persistence_enabled():
         return
     
     logs_dir = get_logs_dir()
     logs_dir.mkdir(exist_ok=True)
     
     # Use session completion time or now if incomplete
-    ts = session.completed_at or datetime.now(timezone.utc).isoformat()
+    ts = session_data["completed_at"] or utc_now_iso()
     # Sanitize timestamp for filename
     ts_str = ts.replace(":", "").replace("-", "").split(".")[0]
     
-    filename = f"lateral-synthesis-session-{ts_str}-{session.session_id[:8]}.jsonl"
+    session_id = session_data["session_id"]
+    filename = f"{HISTORY_PREFIX}{ts_str}-{session_id[:8]}.jsonl"
     file_path = logs_dir / filename
     
     try:
-        with open(file_path, "w") as f:
-            f.write(json.dumps(session.to_dict()) + "\n")
-        logger.info(f"Saved session {session.session_id} to {file_path}")
+        with open(file_path, "wb") as f:
+            f.write(orjson.dumps(session_data, option=orjson.OPT_APPEND_NEWLINE))
+        logger.info(f"Saved session {session_id} to {file_path}")
     except Exception as e:
         logger.error(f"Failed to save session to history: {e}")
 
 
 def log_session_event(session: LateralSession, event_type: str, details: dict | None = None) -> None:
-    """Append a lightweight event log to a per-session log."""
-    config = get_config()
-    if not config.persistence.enabled:
+    """Append a lightweight event record to the shared event log."""
+    if not _persistence_enabled():
         return
 
     logs_dir = get_logs_dir()
     logs_dir.mkdir(exist_ok=True)
 
-    path = logs_dir / f"lateral-synthesis-session-{session.session_id}.jsonl"
+    path = logs_dir / EVENTS_FILENAME
     payload = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_now_iso(),
         "event": event_type,
         "session_id": session.session_id,
     }
     if details:
         payload["details"] = details
 
-    try:
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload) + "\n")
-    except Exception as e:
-        logger.debug(f"Failed to write session log: {e}")
+    SNAPSHOT_WRITER.enqueue(path, orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE))
 
 # Alias for backward compatibility
 save_session_snapshot = log_session_event
 
 
+def _parse_session_line(line: bytes, file_path: str) -> LateralSession | None:
+    """Parse one history record, or return None (with a warning) if it isn't a valid session."""
+    try:
+        data = orjson.loads(line)
+        # Handle both formats:
+        # 1. Direct session dict: {"session_id": ..., ...}
+        # 2. Snapshot wrapper: {"timestamp": ..., "label": ..., "session": {...}}
+        if "session" in data and isinstance(data["session"], dict):
+            # This is a snapshot wrapper - extract the session
+            session_data = data["session"]
+        else:
+            # This is a direct session dict
+            session_data = data
+        return LateralSession.from_dict(session_data)
+    except orjson.JSONDecodeError:
+        logger.warning(f"Skipping invalid JSON line in {file_path}")
+    except Exception as e:
+        logger.warning(f"Skipping invalid session in {file_path}: {e}")
+    return None
+
+
+def _read_last_session(file_path: str) -> LateralSession | None:
+    """
+    Return the last valid session in a history file.
+    
+    The file is memory-mapped and scanned backwards line by line, so only the
+    final record is decoded in the common case.
+    """
+    with open(file_path, "rb") as f:
+        # mmap rejects empty files
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0:
+                start = mm.rfind(b"\n", 0, end) + 1
+                line = mm[start:end].strip()
+                if line:
+                    session = _parse_session_line(line, file_path)
+                    if session is not None:
+                        return session
+                end = start - 1
+    return None
+
+
 def load_sessions_from_history(limit: int = 100) -> list[LateralSession]:
     """Load sessions from the logs directory."""
     logs_dir = get_logs_dir()
-    if not logs_dir.exists():
+    
+    # Find all session log files (names sort by timestamp, newest first)
+    try:
+        with os.scandir(logs_dir) as it:
+            log_files = sorted(
+                (entry for entry in it
+                 if entry.name.startswith(HISTORY_PREFIX) and entry.name.endswith(".jsonl")),
+                key=lambda entry: entry.name,
+                reverse=True,
+            )
+    except FileNotFoundError:
+        _SESSION_CACHE.clear()
         return []
     
-    sessions = []
-    # Find all session log files
-    log_files = sorted(logs_dir.glob("lateral-synthesis-session-*.jsonl"), reverse=True)
+    # Forget files that have been removed
+    for stale_path in _SESSION_CACHE.keys() - {entry.path for entry in log_files}:
+        _SESSION_CACHE.pop(stale_path, None)
+    
+    # Deduplicate sessions by session_id while collecting, keeping the most complete version
+    seen_ids: dict[str, LateralSession] = {}
+    # Session id prefixes (from filenames) whose completed version is already collected
+    completed_prefixes: set[str] = set()
     
     # We only need enough files to potentially fill the limit
     # Since one file = one session, we can just take the first N files
-    for file_path in log_files[:limit]:
+    for entry in log_files[:limit]:
+        file_path = entry.path
+        id_prefix = entry.name[:-len(".jsonl")].rsplit("-", 1)[-1]
+        if id_prefix in completed_prefixes:
+            # A newer file already holds the completed session; nothing to prefer here
+            continue
         try:
-            with open(file_path) as f:
-                last_valid_session = None
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            # Handle both formats:
-                            # 1. Direct session dict: {"session_id": ..., ...}
-                            # 2. Snapshot wrapper: {"timestamp": ..., "label": ..., "session": {...}}
-                            if "session" in data and isinstance(data["session"], dict):
-                                # This is a snapshot wrapper - extract the session
-                                session_data = data["session"]
-                            else:
-                                # This is a direct session dict
-                                session_data = data
-                            last_valid_session = LateralSession.from_dict(session_data)
-                        except json.JSONDecodeError:
-                            logger.warning(f"Skipping invalid JSON line in {file_path}")
-                        except Exception as e:
-                            logger.warning(f"Skipping invalid session in {file_path}: {e}")
+            st = entry.stat()
+            cached = _SESSION_CACHE.get(file_path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                s = cached[2]
+            else:
                 # Only add the last valid session from each file (most recent state)
-                if last_valid_session is not None:
-                    sessions.append(last_valid_session)
+                s = _read_last_session(file_path)
+                _SESSION_CACHE[file_path] = (st.st_mtime_ns, st.st_size, s)
         except Exception as e:
             logger.error(f"Failed to read log file {file_path}: {e}")
-    
-    # Deduplicate sessions by session_id, keeping the most complete version
-    seen_ids: dict[str, LateralSession] = {}
-    for s in sessions:
+            continue
+        if s is None:
+            continue
+        
         existing = seen_ids.get(s.session_id)
-        if existing is None:
-            seen_ids[s.session_id] = s
-        elif s.completed_at and not existing.completed_at:
+        if existing is None or (s.completed_at and not existing.completed_at):
             # Prefer completed sessions
             seen_ids[s.session_id] = s
+        if s.completed_at and s.session_id.startswith(id_prefix):
+            completed_prefixes.add(id_prefix)
     
-    sessions = list(seen_ids.values())
-    # Sort by created_at descending
-    sessions.sort(key=lambda s: s.created_at or "", reverse=True)
-    return sessions[:limit]
+    # Newest `limit` sessions by created_at, without sorting the rest
+    return heapq.nlargest(limit, seen_ids.values(), key=lambda s: s.created_at or "")
@@ -4,11 +4,15 @@ Lateral Synthesis MCP - Tool Handlers
 Implements all tool handlers for the lateral synthesis workflow.
 """
 
-import json
+import asyncio
 import logging
-from datetime import datetime, timezone
+from functools import lru_cache
+
+import orjson
 from mcp.types import TextContent
 
+from utils import utc_now_iso
+
 from .models import (
     SESSIONS,
     CONNECTION_TYPES,
@@ -30,17 +34,27 @@ logger = logging.getLogger(__name__)
 
 def _ok(**payload) -> list[TextContent]:
     """Return a success response (standardized with result wrapper)."""
-    return [TextContent(type="text", text=json.dumps({"status": "success", "result": payload}))]
+    return [TextContent(type="text", text=orjson.dumps({"status": "success", "result": payload}).decode())]
 
 
 def _err(error: str, message: str | None = None, **details) -> list[TextContent]:
     """Return an error response (standardized with details)."""
+    if not details:
+        return _static_err(error, message)
+    payload: dict = {"status": "error", "error": error}
+    if message:
+        payload["message"] = message
+    payload["details"] = details
+    return [TextContent(type="text", text=orjson.dumps(payload).decode())]
+
+
+@lru_cache(maxsize=128)
+def _static_err(error: str, message: str | None) -> list[TextContent]:
+    """Detail-free error responses are constant, so encode each one once (do not mutate)."""
     payload: dict = {"status": "error", "error": error}
     if message:
         payload["message"] = message
-    if details:
-        payload["details"] = details
-    return [TextContent(type="text", text=json.dumps(payload))]
+    return [TextContent(type="text", text=orjson.dumps(payload).decode())]
 
 
 # -----------------------------------------------------------------------------
@@ -131,8 +145,8 @@ async def tool_generate_divergence(args: dict) -> list[TextContent]:
     
     # If overriding, clear prior concepts/syntheses/reflection to keep state consistent
     if args.get("override"):
-        session.divergent_concepts = []
-        session.syntheses = []
+        session.set_divergent_concepts([])
+        session.clear_syntheses()
         session.reflection = None
         session.completed_at = None
 
@@ -143,7 +157,7 @@ async def tool_generate_divergence(args: dict) -> list[TextContent]:
         count=count,
     )
     
-    session.divergent_concepts = concepts
+    session.set_divergent_concepts(concepts)
     
     logger.info(f"Generated {len(concepts)} divergent concepts for session {session.session_id}")
     save_session_snapshot(session, "divergence")
@@ -192,7 +206,7 @@ async def tool_record_synthesis(args: dict) -> list[TextContent]:
     if not divergent_concept:
         return _err("missing_concept", "divergent_concept is required")
     
-    if divergent_concept not in session.divergent_concepts:
+    if not session.has_divergent_concept(divergent_concept):
         return _err(
             "invalid_concept",
             f"'{divergent_concept}' is not one of the divergent concepts for this session",
@@ -257,7 +271,7 @@ async def tool_record_synthesis(args: dict) -> list[TextContent]:
     if errors:
         return _err("validation_error", "Synthesis validation failed", errors=errors)
     
-    session.syntheses.append(synthesis)
+    session.add_synthesis(synthesis)
     remaining = session.get_remaining_concepts()
     save_session_snapshot(session, "synthesis")
     
@@ -359,11 +373,11 @@ async def tool_reflect_on_session(args: dict) -> list[TextContent]:
         return _err("validation_error", "Reflection validation failed", errors=errors)
     
     session.reflection = reflection
-    session.completed_at = datetime.now(timezone.utc).isoformat()
+    session.completed_at = utc_now_iso()
     save_session_snapshot(session, "reflection")
     
-    # Save to history
-    save_session_to_history(session)
+    # Save to history; snapshot on the loop so later tool calls can't tear the write
+    await asyncio.to_thread(save_session_to_history, session.to_dict())
     
     logger.info(f"Session {session.session_id} completed with rating {overall_rating_val}")
     
@@ -450,7 +464,7 @@ async def tool_list_sessions(args: dict) -> list[TextContent]:
     
     # Load from history if requested
     if include_history:
-        history_sessions = load_sessions_from_history(limit=limit)
+        history_sessions = await asyncio.to_thread(load_sessions_from_history, limit=limit)
         # Deduplicate (prefer memory version if exists)
         memory_ids = {s["session_id"] for s in sessions}
         for h_session in history_sessions:
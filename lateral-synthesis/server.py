@@ -9,22 +9,28 @@ Flow: Origin → Divergence → Synthesis → Reflection
 """
 
 import asyncio
-import json
 import logging
 import os
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import orjson
+
+_HERE = Path(__file__).parent
 
 # Add parent directory to path for shared utils
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(_HERE.parent))
 
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, Icon
 
-from utils import setup_logging
+from utils import icon_src, setup_logging
 from modules.models import CONNECTION_TYPES, get_config
 from modules.tools import TOOL_HANDLERS
 
@@ -33,8 +39,9 @@ from modules.tools import TOOL_HANDLERS
 # Tool Definitions
 # -----------------------------------------------------------------------------
 
-TOOLS = [
-    Tool(
+# Static literals, so the models are built without re-running Pydantic validation
+TOOLS = (
+    Tool.model_construct(
         name="start_session",
         description="Start a new lateral synthesis session with an origin concept. The origin is the starting point for generating divergent ideas.",
         inputSchema={
@@ -53,7 +60,7 @@ TOOLS = [
             "required": ["origin"],
         },
     ),
-    Tool(
+    Tool.model_construct(
         name="generate_divergence",
         description="Generate divergent concepts for the current session. These are intentionally unrelated concepts to force lateral thinking. Use override=true to regenerate and reset syntheses.",
         inputSchema={
@@ -75,7 +82,7 @@ TOOLS = [
             "required": [],
         },
     ),
-    Tool(
+    Tool.model_construct(
         name="record_synthesis",
         description="Record a synthesis connecting the origin to one divergent concept. Must be called for each divergent concept.",
         inputSchema={
@@ -112,7 +119,7 @@ TOOLS = [
             "required": ["divergent_concept", "connection_type", "confidence", "insight"],
         },
     ),
-    Tool(
+    Tool.model_construct(
         name="reflect_on_session",
         description="Record meta-reflection after all syntheses are complete. Requires all divergent concepts to be synthesized first.",
         inputSchema={
@@ -145,7 +152,7 @@ TOOLS = [
             "required": ["most_valuable_insight", "why_valuable", "surprising_connections", "overall_rating"],
         },
     ),
-    Tool(
+    Tool.model_construct(
         name="get_session",
         description="Retrieve the current session state, including origin, divergent concepts, syntheses, and reflection.",
         inputSchema={
@@ -159,7 +166,7 @@ TOOLS = [
             "required": [],
         },
     ),
-    Tool(
+    Tool.model_construct(
         name="list_sessions",
         description="List all sessions, both in-memory and from history.",
         inputSchema={
@@ -177,17 +184,17 @@ TOOLS = [
             "required": [],
         },
     ),
-]
+)
 
 
 # -----------------------------------------------------------------------------
 # Server Setup
 # -----------------------------------------------------------------------------
 
-# Create icon from SVG file using file:// URI
-_icon_path = Path(__file__).parent / "assets" / "icon.svg"
+# Create icon from SVG file, inlined as a data: URI (file:// if unreadable)
+_icon_path = _HERE / "assets" / "icon.svg"
 _server_icon = Icon(
-    src=f"file://{_icon_path.resolve()}",
+    src=icon_src(_icon_path),
     mimeType="image/svg+xml",
 )
 
@@ -199,40 +206,63 @@ logger = logging.getLogger(__name__)
 
 
 @server.list_tools()
-async def handle_list_tools() -> list[Tool]:
+async def handle_list_tools() -> tuple[Tool, ...]:
     """Return the list of available tools."""
     return TOOLS
 
 
+# Shared read-only stand-in for omitted arguments (handlers only read args)
+_EMPTY_ARGS: Mapping[str, Any] = MappingProxyType({})
+
+
+@lru_cache(maxsize=64)
+def _unknown_tool_response(name: str) -> list[TextContent]:
+    """Error response for an unknown tool name, built once per name (do not mutate)."""
+    return [TextContent(
+        type="text",
+        text=orjson.dumps({"status": "error", "error": "unknown_tool", "message": f"Unknown tool: {name}"}).decode()
+    )]
+
+
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Dispatch tool calls to the appropriate handler."""
     handler = TOOL_HANDLERS.get(name)
     if not handler:
-        return [TextContent(
-            type="text",
-            text=json.dumps({"status": "error", "error": "unknown_tool", "message": f"Unknown tool: {name}"})
-        )]
+        return _unknown_tool_response(name)
     
-    logger.debug(f"Calling tool: {name} with args: {arguments}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Calling tool: %s with args: %s", name, arguments)
     
     try:
-        result = await handler(arguments or {})
+        result = await handler(arguments if arguments is not None else _EMPTY_ARGS)
         
         return result
     except Exception as e:
         logger.exception("Error in tool %s", name)
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=orjson.dumps({
                 "status": "error",
                 "error": "internal_error",
                 "message": "Tool execution failed",
                 "details": {"tool": name, "reason": str(e)},
-            })
+            }).decode()
         )]
 
 
+# Built once, after all handlers are registered (capabilities reflect them)
+_INIT_OPTS = InitializationOptions(
+    server_name="Lateral Synthesis",
+    server_version="1.0.0",
+    capabilities=server.get_capabilities(
+        notification_options=NotificationOptions(),
+        experimental_capabilities={},
+    ),
+    icons=[_server_icon],
+)
+
+
 # -----------------------------------------------------------------------------
 # Main
 # -----------------------------------------------------------------------------
@@ -252,17 +282,15 @@ async def main():
         await server.run(
             read_stream,
             write_stream,
-            InitializationOptions(
-                server_name="Lateral Synthesis",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-                icons=[_server_icon],
-            ),
+            _INIT_OPTS,
         )
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Prefer uvloop's libuv event loop for the stdio transport
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -0,0 +1,41 @@
+"""Tests for the shared logging setup in utils."""
+
+import atexit
+import logging
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import setup_logging  # noqa: E402
+
+
+@pytest.fixture
+def restore_root_logger():
+    root_logger = logging.getLogger()
+    handlers, level = root_logger.handlers[:], root_logger.level
+    yield
+    root_logger.handlers[:] = handlers
+    root_logger.setLevel(level)
+
+
+def test_logged_exception_keeps_exception_field(tmp_path, restore_root_logger):
+    log_file, listener = setup_logging("test-server", logs_dir=tmp_path, log_level="INFO")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("test").error("Tool %s failed", "demo", exc_info=True)
+    
+    # Drain the queue and close the file handler, as the atexit hook would
+    listener.stop()
+    atexit.unregister(listener.stop)
+    for handler in listener.handlers:
+        handler.close()
+    
+    records = [orjson.loads(line) for line in log_file.read_bytes().splitlines()]
+    error = next(r for r in records if r["level"] == "ERROR")
+    assert error["message"] == "Tool demo failed"
+    assert "ValueError: boom" in error["exception"]
@@ -0,0 +1,50 @@
+"""Every server builds TOOLS with Tool.model_construct (no validation), so check the schemas here."""
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+jsonschema = pytest.importorskip("jsonschema")
+pytest.importorskip("mcp")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# (server directory, module that defines TOOLS)
+SERVERS = [
+    ("ensemble-reasoning", "server"),
+    ("lateral-synthesis", "server"),
+    ("federated-intelligence", "modules.tools"),
+]
+
+
+def _is_server_module(name):
+    return name in ("server", "modules") or name.startswith("modules.")
+
+
+def _load_tools(server_dir, module_name):
+    """Import a server's TOOLS in isolation; each server has its own `server`/`modules`."""
+    saved_modules = {name: sys.modules.pop(name) for name in list(sys.modules) if _is_server_module(name)}
+    saved_path = list(sys.path)
+    # server.py normally puts the repo root (shared utils) on sys.path itself
+    sys.path[:0] = [str(REPO_ROOT / server_dir), str(REPO_ROOT)]
+    try:
+        return list(importlib.import_module(module_name).TOOLS)
+    except ImportError as e:
+        pytest.skip(f"{server_dir} dependencies not installed: {e}")
+    finally:
+        for name in [name for name in sys.modules if _is_server_module(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved_modules)
+        sys.path[:] = saved_path
+
+
+@pytest.mark.parametrize("server_dir, module_name", SERVERS, ids=[server for server, _ in SERVERS])
+def test_input_schemas_are_valid_json_schema(server_dir, module_name):
+    tools = _load_tools(server_dir, module_name)
+    assert tools
+    for tool in tools:
+        try:
+            jsonschema.Draft7Validator.check_schema(tool.inputSchema)
+        except jsonschema.SchemaError as e:
+            pytest.fail(f"{server_dir} tool {tool.name}: {e.message}")
@@ -4,49 +4,161 @@ Shared utilities for MCP servers.
 Provides common logging configuration and helper functions.
 """
 
-import json
+import atexit
+import base64
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recently formatted second
+_TIMESTAMP_CACHE: tuple[int, str] = (-1, "")
+
+
+def utc_now_iso(timestamp: Optional[float] = None) -> str:
+    """
+    Return `timestamp` (epoch seconds, default now) as UTC ISO-8601 with
+    microseconds, formatting the date and time once per second.
+    """
+    global _TIMESTAMP_CACHE
+    if timestamp is None:
+        timestamp = time.time()
+    sec = int(timestamp)
+    # Read the cache once: another thread may replace it between two lookups
+    cache = _TIMESTAMP_CACHE
+    if cache[0] != sec:
+        cache = _TIMESTAMP_CACHE = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+    return f"{cache[1]}.{int((timestamp - sec) * 1_000_000):06d}+00:00"
+
+
+def icon_src(icon_path: Path, mime_type: str = "image/svg+xml") -> str:
+    """
+    Return an icon src for MCP: the file inlined as a base64 data: URI, so
+    clients don't have to read it from disk, or a file:// URI if it can't be read.
+    """
+    try:
+        data = icon_path.read_bytes()
+    except OSError:
+        return f"file://{icon_path.resolve()}"
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
+
 
 class JsonFormatter(logging.Formatter):
     """Format log records as JSON for structured logging."""
     
     def format(self, record: logging.LogRecord) -> str:
         log_obj = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # When the event happened, not when the listener thread formats it
+            "timestamp": utc_now_iso(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-        if record.exc_info:
-            log_obj["exception"] = self.formatException(record.exc_info)
+        # Format the traceback once per record, as logging.Formatter does
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_obj["exception"] = record.exc_text
         # Include any extra fields
         for key in ("session_id", "agent_lens", "thought_id"):
             if hasattr(record, key):
                 log_obj[key] = getattr(record, key)
-        return json.dumps(log_obj)
+        return orjson.dumps(log_obj, default=str).decode()
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders %(asctime)s once per second instead of per record."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (whole second, formatted time) for the most recent record
+        self._last_time: tuple[int, str] = (-1, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        # Without a datefmt the default output includes milliseconds
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        if self._last_time[0] != sec:
+            self._last_time = (sec, super().formatTime(record, datefmt))
+        return self._last_time[1]
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that lets records accumulate in a large write buffer.
+    
+    The stream is flushed for ERROR and above (and on close) instead of after
+    every record, so routine DEBUG/INFO output costs a syscall per buffer
+    rather than per line. The file is opened on the first record.
+    """
+    
+    def __init__(self, filename: Path, buffer_size: int = 64 * 1024):
+        self.buffer_size = buffer_size
+        super().__init__(filename, delay=True)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            # Never reopen after close() (e.g. records emitted during shutdown);
+            # stricter than FileHandler, which still reopens in append mode
+            if self._closed:
+                return
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records as-is.
+    
+    The stock prepare() formats the message and traceback on the calling
+    thread and drops exc_info; here all formatting happens on the
+    QueueListener thread, so JsonFormatter still sees exc_info. Arguments
+    are formatted later, so log values rather than objects mutated afterwards.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def setup_logging(
     server_name: str,
     logs_dir: Optional[Path] = None,
     log_level: Optional[str] = None,
-) -> Path:
+) -> tuple[Optional[Path], logging.handlers.QueueListener]:
     """
     Configure logging with console and file handlers.
     
+    The handlers run on a QueueListener thread; the root logger only gets a
+    QueueHandler, so logging from the event loop never waits on I/O. The
+    listener is stopped (draining queued records) at interpreter exit.
+    
     Args:
         server_name: Name of the server (used in log filename)
         logs_dir: Directory for log files (default: ~/.local/state/mcp/logs/)
         log_level: Log level (default: from MCP_LOG_LEVEL env or DEBUG)
         
     Returns:
-        Path to the log file
+        Path to the log file, or None when no file handler was attached (the
+        file handler is only installed at INFO or below), and the listener
+        that owns the handlers
     """
     # Determine log level
     if log_level is None:
@@ -61,32 +173,45 @@ def setup_logging(
     # Console handler (stderr for MCP compatibility)
     console_handler = logging.StreamHandler(sys.stderr)
     console_handler.setLevel(log_level_value)
-    console_format = logging.Formatter(
+    console_format = CachedTimeFormatter(
         "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S"
     )
     console_handler.setFormatter(console_format)
-    root_logger.addHandler(console_handler)
+    handlers: list[logging.Handler] = [console_handler]
     
     # Determine logs directory
     if logs_dir is None:
         # Use XDG standard path on Linux
         state_dir = Path(os.getenv("XDG_STATE_HOME", Path.home() / ".local" / "state"))
         logs_dir = state_dir / "mcp" / "logs"
-    logs_dir.mkdir(parents=True, exist_ok=True)
     
-    # File handler (JSON format)
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
     log_file = logs_dir / f"{server_name}-{timestamp}.jsonl"
     
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(log_level_value)
-    file_handler.setFormatter(JsonFormatter())
-    root_logger.addHandler(file_handler)
+    # File handler (JSON format); skipped entirely when logging is turned down to
+    # WARNING or above, and opened lazily so an idle server never touches disk
+    log_path: Optional[Path] = None
+    if log_level_value <= logging.INFO:
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        file_handler = BufferedFileHandler(log_file)
+        file_handler.setLevel(log_level_value)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+        log_path = log_file
+    
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    root_logger.addHandler(DeferredQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
     # Align MCP logger with configured level
     logging.getLogger("mcp").setLevel(log_level_value)
     
-    logging.info(f"Logging initialized: console + {log_file}")
+    if log_path is not None:
+        logging.info(f"Logging initialized: console + {log_path}")
+    else:
+        logging.info("Logging initialized: console only")
     
-    return log_file
+    return log_path, listener